@@ -1,4 +1,5 @@
 import sqlite3
+from contextlib import contextmanager
 from typing import Any, List, Dict, Optional, Union
 import threading
 from pathlib import Path
@@ -12,6 +13,9 @@ class DatabaseManager:
         """
         self.db_path = db_path
         self._local = threading.local()  # 线程本地存储
+        # WAL 模式写入数据库文件后持久生效，只需设置一次；内存数据库不支持 WAL
+        self._wal_pending = db_path != ':memory:'
+        self._wal_lock = threading.Lock()
         self._ensure_db_exists()
 
     def _ensure_db_exists(self):
@@ -24,61 +28,130 @@ class DatabaseManager:
     def connection(self) -> sqlite3.Connection:
         """获取当前线程的数据库连接"""
         if not hasattr(self._local, 'connection'):
-            self._local.connection = sqlite3.connect(self.db_path)
+            # 自动提交模式，多语句事务由 transaction() 显式管理
+            self._local.connection = sqlite3.connect(self.db_path, isolation_level=None)
             # 设置行工厂为字典类型
             self._local.connection.row_factory = sqlite3.Row
+            self._configure_pragmas(self._local.connection)
         return self._local.connection
 
+    def _configure_pragmas(self, connection: sqlite3.Connection):
+        """
+        连接建立时设置一次的性能参数
+        WAL 让定时写入不阻塞读取，synchronous=NORMAL 在 WAL 下减少每次提交的 fsync
+        """
+        try:
+            if self._wal_pending:
+                with self._wal_lock:
+                    if self._wal_pending:
+                        connection.execute("PRAGMA journal_mode=WAL")
+                        self._wal_pending = False
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA temp_store=MEMORY")
+            connection.execute("PRAGMA busy_timeout=5000")
+            connection.execute("PRAGMA cache_size=-20000")
+        except Exception as e:
+            print(f"Configure pragmas error: {str(e)}")
+
     def close(self):
         """关闭当前线程的数据库连接"""
         if hasattr(self._local, 'connection'):
             self._local.connection.close()
             delattr(self._local, 'connection')
 
+    def _in_transaction(self) -> bool:
+        """当前线程是否处于 transaction() 开启的事务中"""
+        return getattr(self._local, 'transaction_depth', 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        在同一个事务中执行多条语句，退出时一次性提交（异常时回滚）
+        可以嵌套，只有最外层负责提交
+        使用 BEGIN IMMEDIATE 在开始时就取得写锁，避免事务中途升级写锁时遇到 SQLITE_BUSY
+        """
+        depth = getattr(self._local, 'transaction_depth', 0)
+        if depth == 0 and not self.connection.in_transaction:
+            self.connection.execute("BEGIN IMMEDIATE")
+        self._local.transaction_depth = depth + 1
+        try:
+            yield self
+        except Exception:
+            self._local.transaction_depth = depth
+            if depth == 0:
+                self.connection.rollback()
+            raise
+        self._local.transaction_depth = depth
+        if depth == 0:
+            self.connection.commit()
+
     def execute(self, sql: str, params: tuple = ()) -> bool:
         """
         执行SQL语句
         :param sql: SQL语句
         :param params: SQL参数
-        :return: 是否执行成功
+        :return: 是否执行成功（在 transaction() 中出错时抛出异常，由事务整体回滚）
         """
         try:
             cursor = self.connection.cursor()
             cursor.execute(sql, params)
-            self.connection.commit()
+            # 事务中由 transaction() 统一提交
+            if not self._in_transaction():
+                self.connection.commit()
             return True
         except Exception as e:
             print(f"Execute SQL error: {str(e)}")
+            # 事务中不能吞掉异常，否则 transaction() 会提交部分成功的语句
+            if self._in_transaction():
+                raise
             self.connection.rollback()
             return False
 
-    def query_one(self, sql: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+    def executemany(self, sql: str, rows: List[tuple]) -> bool:
+        """
+        对多组参数批量执行同一条SQL，在一个事务中完成并只提交一次
+        :param sql: SQL语句
+        :param rows: 每行一组SQL参数
+        :return: 是否执行成功（嵌套在外层 transaction() 中出错时抛出异常）
+        """
+        try:
+            with self.transaction():
+                self.connection.executemany(sql, rows)
+            return True
+        except Exception as e:
+            print(f"Execute many SQL error: {str(e)}")
+            if self._in_transaction():
+                raise
+            return False
+
+    def query_one(self, sql: str, params: tuple = (), raw: bool = False) -> Optional[Union[Dict[str, Any], sqlite3.Row]]:
         """
         查询单条记录
         :param sql: SQL语句
         :param params: SQL参数
+        :param raw: 为True时直接返回sqlite3.Row（可按列名或下标访问），不复制为字典
         :return: 查询结果字典或None
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(sql, params)
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            row = self.connection.execute(sql, params).fetchone()
+            if row is None or raw:
+                return row
+            return dict(row)
         except Exception as e:
             print(f"Query one error: {str(e)}")
             return None
 
-    def query_all(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    def query_all(self, sql: str, params: tuple = (), raw: bool = False) -> List[Union[Dict[str, Any], sqlite3.Row]]:
         """
         查询多条记录
         :param sql: SQL语句
         :param params: SQL参数
+        :param raw: 为True时直接返回sqlite3.Row列表，不复制为字典
         :return: 查询结果列表
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(sql, params)
-            return [dict(row) for row in cursor.fetchall()]
+            rows = self.connection.execute(sql, params).fetchall()
+            return rows if raw else [dict(row) for row in rows]
         except Exception as e:
             print(f"Query all error: {str(e)}")
             return []
@@ -95,6 +168,25 @@ class DatabaseManager:
         sql = f"INSERT INTO {table} ({fields}) VALUES ({placeholders})"
         return self.execute(sql, tuple(data.values()))
 
+    def upsert(self, table: str, data: Dict[str, Any], conflict_cols: List[str],
+               update_cols: Optional[List[str]] = None) -> bool:
+        """
+        插入数据，冲突时改为更新（一条语句完成，无需先查询是否存在）
+        :param table: 表名
+        :param data: 要写入的数据字典
+        :param conflict_cols: 判断冲突的列（主键或唯一约束）
+        :param update_cols: 冲突时更新的列，默认更新除冲突列以外的全部列
+        :return: 是否写入成功
+        """
+        fields = ','.join(data.keys())
+        placeholders = ','.join(['?' for _ in data])
+        if update_cols is None:
+            update_cols = [k for k in data if k not in conflict_cols]
+        set_clause = ','.join([f"{k}=excluded.{k}" for k in update_cols])
+        sql = (f"INSERT INTO {table} ({fields}) VALUES ({placeholders}) "
+               f"ON CONFLICT({','.join(conflict_cols)}) DO UPDATE SET {set_clause}")
+        return self.execute(sql, tuple(data.values()))
+
     def update(self, table: str, data: Dict[str, Any], where: str, params: tuple = ()) -> bool:
         """
         更新数据
@@ -119,15 +211,18 @@ class DatabaseManager:
         sql = f"DELETE FROM {table} WHERE {where}"
         return self.execute(sql, params)
 
-    def create_table(self, table: str, fields: Dict[str, str]) -> bool:
+    def create_table(self, table: str, fields: Dict[str, str], without_rowid: bool = False) -> bool:
         """
         创建表
         :param table: 表名
         :param fields: 字段定义字典，key为字段名，value为字段类型定义
+        :param without_rowid: 为True时创建 WITHOUT ROWID 表，按主键聚簇存储，主键查找只需一次B树探查
         :return: 是否创建成功
         """
         field_defs = ','.join([f"{k} {v}" for k, v in fields.items()])
         sql = f"CREATE TABLE IF NOT EXISTS {table} ({field_defs})"
+        if without_rowid:
+            sql += " WITHOUT ROWID"
         return self.execute(sql)
 
     def table_exists(self, table: str) -> bool:
@@ -0,0 +1,202 @@
+import atexit
+import os
+import queue
+import re
+import sys
+import threading
+import time
+
+_IOV_BATCH = 1024  # Max buffers per writev() call, the common IOV_MAX
+
+# Background writer: file writes are queued as (kind, path, payload, on_done) and applied in order
+_write_queue = queue.SimpleQueue()
+_writer_thread = None
+_writer_lock = threading.Lock()
+
+# Deferred calls run by the writer thread: key -> (monotonic deadline, function)
+_deadlines = {}
+_deadline_lock = threading.Lock()
+
+# One "key=value" entry per line; surrounding blanks are trimmed and lines without "=" are skipped
+_KV_RE = re.compile(r"^[ \t]*([^=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t\r]*$", re.M)
+
+
+def ensure_file(path):
+    # Create the file if it doesn't exist, a single open() instead of exists() + touch()
+    os.close(os.open(path, os.O_RDONLY | os.O_CREAT, 0o644))
+
+
+def stat_key(path):
+    # (mtime_ns, size) of a file, used to tell whether it changed since it was last parsed
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def refresh_file_stat(file_stats, path):
+    # Our own writes keep the parsed data in sync, don't treat them as outside changes
+    if path in file_stats:
+        file_stats[path] = stat_key(path)
+
+
+def read_text_file(path):
+    # Read a whole file with a single os.read and decode it once
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, os.fstat(fd).st_size).decode("utf-8")
+    finally:
+        os.close(fd)
+
+
+def append_buffers(path, buffers):
+    # Append all buffers to the file, one writev() per batch where the platform supports it
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        if hasattr(os, "writev"):
+            for i in range(0, len(buffers), _IOV_BATCH):
+                batch = buffers[i:i + _IOV_BATCH]
+                written = os.writev(fd, batch)
+                if written < sum(map(len, batch)):
+                    _write_all(fd, b"".join(batch)[written:])
+        else:
+            _write_all(fd, b"".join(buffers))
+    finally:
+        os.close(fd)
+
+
+def rewrite_file(path, data):
+    # Replace the whole content of the file with data
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        _write_all(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def parse_key_values(data):
+    # Parse "key=value" lines, later occurrences of a key win
+    return dict([(sys.intern(key), value) for key, value in _KV_RE.findall(data)])
+
+
+def submit_write(kind, path, payload, on_done=None):
+    # Queue a write for the background writer thread and return immediately.
+    # kind is "append" (payload: list of bytes), "rewrite" (payload: whole new content)
+    # or "call" (payload: function run on the writer thread); on_done runs after the write.
+    # "barrier" and "wake" are used internally
+    if not _start_writer():
+        # No thread can be started at interpreter shutdown, write synchronously instead
+        _apply_write(kind, path, payload, on_done)
+        return
+    _write_queue.put((kind, path, payload, on_done))
+
+
+def schedule_call(key, delay, fn, restart=True):
+    # Run fn on the writer thread after delay seconds, at most once per key. With restart a new call
+    # for a pending key pushes its deadline back (debounce), otherwise the pending deadline is kept
+    if not _start_writer():
+        # No thread can be started at interpreter shutdown, run it right away instead
+        fn()
+        return
+    with _deadline_lock:
+        pending = key in _deadlines
+        if pending and not restart:
+            return
+        _deadlines[key] = (time.monotonic() + delay, fn)
+    if not pending:
+        # Wake the writer so it waits for the new deadline, a later deadline needs no wake-up
+        _write_queue.put(("wake", None, None, None))
+
+
+def cancel_call(key):
+    # Drop a pending scheduled call, if any
+    with _deadline_lock:
+        _deadlines.pop(key, None)
+
+
+def wait_for_writes(timeout=None):
+    # Block until everything queued so far has been written
+    if _writer_thread is None:
+        return True
+    done = threading.Event()
+    _write_queue.put(("barrier", None, done, None))
+    return done.wait(timeout)
+
+
+def _start_writer():
+    # Start the writer thread on first use, returns whether it is running
+    global _writer_thread
+    if _writer_thread is None:
+        with _writer_lock:
+            if _writer_thread is None:
+                thread = threading.Thread(target=_writer_loop, name="ARCFileWriter", daemon=True)
+                try:
+                    thread.start()
+                except RuntimeError:
+                    return False
+                _writer_thread = thread
+    return True
+
+
+def _writer_loop():
+    while True:
+        try:
+            op = _write_queue.get(timeout=_run_due_calls())
+        except queue.Empty:
+            continue
+        # Take everything that is queued right now and apply it as one batch
+        ops = [op]
+        try:
+            while True:
+                ops.append(_write_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        for op in _coalesce(ops):
+            _apply_write(*op)
+
+
+def _run_due_calls():
+    # Run the scheduled calls whose deadline has passed, return the seconds until the next one (None if none)
+    now = time.monotonic()
+    with _deadline_lock:
+        due = [key for key, (deadline, _) in _deadlines.items() if deadline <= now]
+        calls = [_deadlines.pop(key)[1] for key in due]
+        next_deadline = min((deadline for deadline, _ in _deadlines.values()), default=None)
+    for fn in calls:
+        try:
+            fn()
+        except Exception as e:
+            print(f"Scheduled call error: {str(e)}")
+    return None if next_deadline is None else max(next_deadline - now, 0)
+
+
+def _apply_write(kind, path, payload, on_done):
+    try:
+        if kind == "append":
+            append_buffers(path, payload)
+        elif kind == "rewrite":
+            rewrite_file(path, payload)
+        elif kind == "call":
+            payload()
+        elif kind == "barrier":
+            payload.set()
+        if on_done is not None:
+            on_done()
+    except Exception as e:
+        print(f"Write file error: {str(e)}")
+
+
+def _coalesce(ops):
+    # A rewrite makes every earlier queued write to the same path redundant
+    last_rewrite = {op[1]: i for i, op in enumerate(ops) if op[0] == "rewrite"}
+    if not last_rewrite:
+        return ops
+    return [op for i, op in enumerate(ops) if i >= last_rewrite.get(op[1], -1)]
+
+
+atexit.register(wait_for_writes, 10.0)
@@ -1,53 +1,152 @@
-import os
+import atexit
+import functools
+import logging
+import threading
+from collections import defaultdict
 from pathlib import Path
 
+from .FileUtils import (
+    cancel_call, ensure_file, read_text_file, parse_key_values, refresh_file_stat, schedule_call, stat_key,
+    submit_write
+)
+
 MAIN_PATH = 'ARCRealisticSurvival'
+_FLUSH_CALL = 'language-flush-missing'  # Key of the scheduled missing-key flush
+
+_logger = logging.getLogger(__name__)
 
 class LanguageManager:
     language_dict = {}  # Class variable shared across instances
+    _file_stat = {}  # Path -> (mtime_ns, size) of the file when it was last parsed
+    _path_cache = {}  # Language code -> (Path, str) of its language file
+    _dir_ready = False  # Whether the config directory has been created
+    _known_files = set()  # Language files known to exist
+    flush_delay = 0.5  # Seconds to collect missing keys before appending them to the files
+    _pending_missing = {}  # Language code -> missing keys not yet appended to its file (ordered set)
+    _flush_lock = threading.Lock()  # Guards _pending_missing
+    _locks = defaultdict(threading.Lock)  # Language code -> lock for its table
+    _warned_keys = set()  # (language, key) pairs already reported as missing
 
     def __init__(self, default_language_code):
         self.language_code = default_language_code.upper()
-        if self.language_code not in LanguageManager.language_dict:
-            LanguageManager.language_dict[self.language_code] = {}
 
         # Use Path for cross-platform compatibility
-        self.language_file_path = Path(MAIN_PATH) / f"{self.language_code}.txt"
-        self._load_language_file()
+        self.language_file_path, self._language_file_str = self._get_file_path(self.language_code)
+        LanguageManager._load_language_file(self.language_code)
+
+    @staticmethod
+    def _ensure_loaded(lang):
+        # Load a language table on first use without constructing a manager
+        if lang not in LanguageManager.language_dict:
+            LanguageManager._load_language_file(lang)
+
+    @staticmethod
+    def _load_language_file(lang):
+        if lang not in LanguageManager.language_dict:
+            LanguageManager.language_dict[lang] = {}
+        language_file_path, language_file_str = LanguageManager._get_file_path(lang)
 
-    def _load_language_file(self):
-        # Create config directory if not exists
-        self.language_file_path.parent.mkdir(exist_ok=True)
+        # Create config directory if not exists (once per process)
+        if not LanguageManager._dir_ready:
+            language_file_path.parent.mkdir(exist_ok=True)
+            LanguageManager._dir_ready = True
 
-        # Create language file if not exists
-        if not self.language_file_path.exists():
-            self.language_file_path.touch()
+        # Create language file if not exists (once per file)
+        if language_file_str not in LanguageManager._known_files:
+            ensure_file(language_file_str)
+            LanguageManager._known_files.add(language_file_str)
 
-        # Load language file content
-        with self.language_file_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and "=" in line:
-                    key, value = line.split("=", 1)
-                    LanguageManager.language_dict[self.language_code][key.strip()] = value.strip()
+        # Skip parsing if the file hasn't changed since it was last loaded
+        try:
+            file_stat = stat_key(language_file_str)
+        except FileNotFoundError:
+            # Deleted while the server runs, create it (and the directory) again
+            LanguageManager._dir_ready = False
+            LanguageManager._known_files.discard(language_file_str)
+            return LanguageManager._load_language_file(lang)
+        if LanguageManager._file_stat.get(language_file_str) == file_stat:
+            return
+
+        # Load language file content in one read and parse it in bulk
+        entries = parse_key_values(read_text_file(language_file_str))
+        with LanguageManager._locks[lang]:
+            # A first load adopts the parsed dict as is; reloads merge it in one presized update
+            if LanguageManager.language_dict[lang]:
+                LanguageManager.language_dict[lang].update(entries)
+            else:
+                LanguageManager.language_dict[lang] = entries
+            _lookup_text.cache_clear()
+            LanguageManager._file_stat[language_file_str] = file_stat
+
+    @staticmethod
+    def _get_file_path(lang):
+        paths = LanguageManager._path_cache.get(lang)
+        if paths is None:
+            path = Path(MAIN_PATH) / f"{lang}.txt"
+            paths = LanguageManager._path_cache[lang] = (path, str(path))
+        return paths
 
     def GetText(self, key, lang_code=None):
         # If no language code provided, use instance's language code
         target_lang = (lang_code or self.language_code).upper()
 
+        # Fast path: memoized lookup of a non-empty text
+        value = _lookup_text(target_lang, key)
+        if value:
+            return value
+
         # If the target language hasn't been loaded yet, load it
-        if target_lang not in LanguageManager.language_dict:
-            temp_manager = LanguageManager(target_lang)
-
-        # If key doesn't exist in target language, add it
-        if key not in LanguageManager.language_dict[target_lang]:
-            target_file_path = Path(MAIN_PATH) / f"{target_lang}.txt"
-            with target_file_path.open("a", encoding="utf-8") as f:
-                f.write(f"\n{key}=")
-            LanguageManager.language_dict[target_lang][key] = ""
-
-        if not LanguageManager.language_dict[target_lang][key]:
-            print(f'[ARC Core]Key {key} not found in language file {target_lang}.txt.')
+        LanguageManager._ensure_loaded(target_lang)
+
+        # If key doesn't exist in target language, add it (written to the file in a later batch)
+        table = LanguageManager.language_dict[target_lang]
+        value = table.get(key)
+        if value is None:
+            added = False
+            with LanguageManager._locks[target_lang]:
+                # Re-check under the lock, another thread may have added it meanwhile
+                value = table.get(key)
+                if value is None:
+                    value = table[key] = ""
+                    _lookup_text.cache_clear()
+                    with LanguageManager._flush_lock:
+                        LanguageManager._pending_missing.setdefault(target_lang, {})[key] = None
+                    added = True
+            if added:
+                # Collect keys for flush_delay after the first miss, then write them on the writer thread
+                schedule_call(_FLUSH_CALL, LanguageManager.flush_delay, LanguageManager.flush_missing, restart=False)
+
+        if not value:
+            LanguageManager._log_missing(key, target_lang)
             return ''
-        else:
-            return LanguageManager.language_dict[target_lang][key]
\ No newline at end of file
+        return value
+
+    @staticmethod
+    def _log_missing(key, lang):
+        # Report each missing key once, and only when debug logging is on
+        if (lang, key) not in LanguageManager._warned_keys and _logger.isEnabledFor(logging.DEBUG):
+            LanguageManager._warned_keys.add((lang, key))
+            _logger.debug('[ARC Core]Key %s not found in language file %s.txt.', key, lang)
+
+    @staticmethod
+    def flush_missing():
+        # Append all collected missing keys, opening each language file only once
+        with LanguageManager._flush_lock:
+            cancel_call(_FLUSH_CALL)
+            pending, LanguageManager._pending_missing = LanguageManager._pending_missing, {}
+
+        # The background writer serializes the appends, so the files need no extra locking here
+        for lang, keys in pending.items():
+            target_file_str = LanguageManager._get_file_path(lang)[1]
+            submit_write("append", target_file_str, [b"\n" + key.encode("utf-8") + b"=" for key in keys],
+                         functools.partial(refresh_file_stat, LanguageManager._file_stat, target_file_str))
+
+
+@functools.lru_cache(maxsize=1024)
+def _lookup_text(lang, key):
+    # Memoized (language, key) -> text, cleared whenever a language table changes
+    table = LanguageManager.language_dict.get(lang)
+    return None if table is None else table.get(key)
+
+
+atexit.register(LanguageManager.flush_missing)
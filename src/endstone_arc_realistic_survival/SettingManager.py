@@ -1,45 +1,177 @@
-import os
+import atexit
+import functools
+import mmap
+import threading
 from pathlib import Path
 
+from .FileUtils import (
+    append_buffers, cancel_call, ensure_file, read_text_file, parse_key_values, refresh_file_stat, schedule_call,
+    stat_key, submit_write
+)
+
 MAIN_PATH = 'ARCRealisticSurvival'
+_FLUSH_CALL = 'settings-flush'  # Key of the scheduled settings flush
 
 class SettingManager:
     setting_dict = {}  # Class variable to store all settings
+    flush_delay = 0.2  # Seconds to wait before writing batched changes to disk
+    _dirty_keys = {}  # Keys changed in setting_dict but not yet written to disk (ordered set)
+    _append_bytes = 0  # Bytes appended to the file since it was last compacted
+    _compacted_size = 0  # Size of the file right after it was last compacted/loaded
+    _disk_values = {}  # Value of the last occurrence of each key in the file
+    _flush_lock = threading.Lock()
+    _atexit_registered = False
+    _file_stat = {}  # Path -> (mtime_ns, size) of the file when it was last parsed
+    _file_path = Path(MAIN_PATH) / "settings.yml"
+    _file_str = str(_file_path)
+    _file_ready = False  # Whether the config directory and settings file have been created
+    _on_written = staticmethod(functools.partial(refresh_file_stat, _file_stat, _file_str))  # Run after our own writes
 
     def __init__(self):
-        self.setting_file_path = Path(MAIN_PATH) / "settings.yml"
+        self.setting_file_path = SettingManager._file_path
         self._load_setting_file()
 
+        # Make sure pending changes reach the disk on interpreter shutdown
+        if not SettingManager._atexit_registered:
+            atexit.register(self.flush)
+            SettingManager._atexit_registered = True
+
     def _load_setting_file(self):
-        # Create config directory if not exists
-        self.setting_file_path.parent.mkdir(exist_ok=True)
+        if not SettingManager._file_ready:
+            # Create config directory if not exists
+            self.setting_file_path.parent.mkdir(exist_ok=True)
 
-        # Create settings file if not exists
-        if not self.setting_file_path.exists():
-            self.setting_file_path.touch()
+            # Create settings file if not exists
+            ensure_file(SettingManager._file_str)
+            SettingManager._file_ready = True
 
-        # Load settings file content
-        with self.setting_file_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line and "=" in line:
-                    key, value = line.split("=", 1)
-                    SettingManager.setting_dict[key.strip()] = value.strip()
+        # Skip parsing if the file hasn't changed since it was last loaded
+        try:
+            file_stat = stat_key(SettingManager._file_str)
+        except FileNotFoundError:
+            # Deleted while the server runs, create it again
+            SettingManager._file_ready = False
+            return self._load_setting_file()
+        if SettingManager._file_stat.get(SettingManager._file_str) == file_stat:
+            return
+
+        # Load settings file content in one read and parse it in bulk
+        entries = parse_key_values(read_text_file(SettingManager._file_str))
+        SettingManager.setting_dict.update(entries)
+        _lookup_setting.cache_clear()
+        SettingManager._disk_values = entries
+        SettingManager._file_stat[SettingManager._file_str] = file_stat
+        SettingManager._compacted_size = file_stat[1]
+        SettingManager._append_bytes = 0
 
     def GetSetting(self, key):
-        # If key doesn't exist in settings, add it
-        if key not in SettingManager.setting_dict:
-            with self.setting_file_path.open("a", encoding="utf-8") as f:
-                f.write(f"\n{key}=")
+        # Fast path: memoized lookup of a non-empty setting
+        value = _lookup_setting(key)
+        if value:
+            return value
+
+        # If key doesn't exist in settings, add it (appended to the file by the next flush)
+        if value is None and key not in SettingManager.setting_dict:
             SettingManager.setting_dict[key] = ""
+            _lookup_setting.cache_clear()
+            self._schedule_flush(key)
 
-        return None if not SettingManager.setting_dict[key] else SettingManager.setting_dict[key]
+        # Only empty or freshly added settings get here
+        return None
 
     def SetSetting(self, key, value):
-        # Update setting in memory
+        # Update setting in memory, the change is appended to the file later in one batch
         SettingManager.setting_dict[key] = str(value)
+        _lookup_setting.cache_clear()
+        self._schedule_flush(key)
+
+    def _schedule_flush(self, key):
+        with SettingManager._flush_lock:
+            SettingManager._dirty_keys[key] = None
+        # Debounce on the writer thread: each call pushes the flush back so a burst causes a single write
+        schedule_call(_FLUSH_CALL, SettingManager.flush_delay, self.flush)
+
+    def flush(self):
+        # Hand all pending changes to the background writer as a single journal append,
+        # the last occurrence of a key wins when the file is loaded again
+        with SettingManager._flush_lock:
+            cancel_call(_FLUSH_CALL)
+            if not SettingManager._dirty_keys:
+                return
+            keys, SettingManager._dirty_keys = SettingManager._dirty_keys, {}
+            # This runs on the timer thread while the server thread may insert keys, work on a copy
+            settings = SettingManager.setting_dict.copy()
+
+            # Values that keep their encoded length are overwritten in place
+            patches = []
+            appends = []
+            for k in keys:
+                old = SettingManager._disk_values.get(k)
+                new = settings[k]
+                if old is not None and old != new and len(old.encode("utf-8")) == len(new.encode("utf-8")):
+                    patches.append((k, old, new))
+                elif old != new:
+                    appends.append(k)
+            if patches:
+                for k, _, new in patches:
+                    SettingManager._disk_values[k] = new
+                submit_write("call", SettingManager._file_str, functools.partial(self._patch_in_place, patches),
+                             self._on_written)
+            if not appends:
+                return
+
+            buf = "".join(f"\n{k}={settings[k]}" for k in appends).encode("utf-8")
+
+            # Compact once the journal has grown past twice the size of the live settings
+            if SettingManager._append_bytes + len(buf) > 2 * max(SettingManager._compacted_size, 1):
+                self._compact(settings)
+            else:
+                submit_write("append", SettingManager._file_str, [buf], self._on_written)
+                SettingManager._append_bytes += len(buf)
+                for k in appends:
+                    SettingManager._disk_values[k] = settings[k]
+
+    def _compact(self, settings):
+        # Rewrite the file with one line per key from a snapshot of setting_dict, dropping superseded entries
+        buf = "".join(f"{k}={v}\n" for k, v in settings.items()).encode("utf-8")
+        submit_write("rewrite", SettingManager._file_str, buf, self._on_written)
+        SettingManager._compacted_size = len(buf)
+        SettingManager._append_bytes = 0
+        SettingManager._disk_values = settings
+
+    def _patch_in_place(self, patches):
+        # Overwrite "key=old" with "key=new" through mmap (runs on the writer thread),
+        # lines that can't be located are appended instead
+        missed = []
+        with self.setting_file_path.open("r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+            for key, old, new in patches:
+                key_bytes = key.encode("utf-8")
+                pos = self._rfind_line(mm, key_bytes + b"=" + old.encode("utf-8"))
+                if pos < 0:
+                    missed.append(b"\n" + key_bytes + b"=" + new.encode("utf-8"))
+                    continue
+                start = pos + len(key_bytes) + 1
+                new_bytes = new.encode("utf-8")
+                mm[start:start + len(new_bytes)] = new_bytes
+            mm.flush()
+        if missed:
+            append_buffers(SettingManager._file_str, missed)
+
+    @staticmethod
+    def _rfind_line(buf, line):
+        # Offset of the last occurrence of line that spans a whole line in buf, or -1
+        end = len(buf)
+        while True:
+            pos = buf.rfind(line, 0, end)
+            if pos < 0:
+                return -1
+            after = pos + len(line)
+            if (pos == 0 or buf[pos - 1] == 0x0A) and (after == len(buf) or buf[after] in b"\r\n"):
+                return pos
+            end = after - 1
+
 
-        # Rewrite entire file with updated settings
-        with self.setting_file_path.open("w", encoding="utf-8") as f:
-            for k, v in SettingManager.setting_dict.items():
-                f.write(f"{k}={v}\n")
\ No newline at end of file
+@functools.lru_cache(maxsize=1024)
+def _lookup_setting(key):
+    # Memoized key -> setting value, cleared whenever setting_dict changes
+    return SettingManager.setting_dict.get(key)
@@ -1,18 +1,54 @@
-import datetime
 import os
 import json
+import logging
 import math
+import time
+import weakref
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 from endstone.command import Command, CommandSender
 from endstone.event import event_handler, PlayerItemConsumeEvent, PlayerMoveEvent, PlayerJoinEvent, PlayerQuitEvent, PlayerDeathEvent
 from endstone.plugin import Plugin
-from endstone.form import ModalForm, Label, TextInput
+from endstone.form import ActionForm, ModalForm, Label, TextInput
 
 from .DatabaseManager import DatabaseManager
+from .FileUtils import wait_for_writes
 from .LanguageManager import LanguageManager
 from .SettingManager import SettingManager
 
 
+_now_iso_cache = (0, "")  # (整秒时间戳, 格式化结果)
+
+
+def _utc_now_iso() -> str:
+    """当前 UTC 时间的 ISO 8601 字符串（精确到秒），同一秒内的调用复用同一个字符串"""
+    global _now_iso_cache
+    sec = int(time.time())
+    cached_sec, text = _now_iso_cache
+    if sec != cached_sec:
+        text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _now_iso_cache = (sec, text)
+    return text
+
+
+# 背包物品按钮文本模板：名称、类型ID、数量
+_INV_ITEM_TPL = "%s (ID: %s) x%d"
+
+# 常用查询语句，保持文本不变以命中 sqlite3 的语句缓存
+_SQL_ITEM_BY_ITEM_ID = "SELECT * FROM thirst_items WHERE item_id=?"
+_SQL_ALL_ITEMS = "SELECT * FROM thirst_items"
+_SQL_ALL_PLAYER_THIRST = "SELECT xuid, thirst FROM player_thirst"
+_SQL_UPSERT_PLAYER_THIRST = (
+    "INSERT INTO player_thirst (xuid,player_name,thirst,updated_at) VALUES (?,?,?,?) "
+    "ON CONFLICT(xuid) DO UPDATE SET player_name=excluded.player_name,thirst=excluded.thirst,updated_at=excluded.updated_at"
+)
+
+
 class ARCRealisticSurvivalPlugin(Plugin):
     prefix = "ARCRealisticSurvivalPlugin"
     api_version = "0.10"
@@ -46,34 +82,76 @@ class ARCRealisticSurvivalPlugin(Plugin):
         super().__init__()
         # 生存-口渴系统相关
         self.player_xuid_to_thirst = {}
-        self.player_moving_flags = {}  # 存储玩家移动状态的字典
+        self.player_moving = set()  # 上次tick后移动过的玩家xuid，每次tick后清空
         self.thirst_decay_per_second = 0.1  # 每秒减少的口渴值
         self.thirst_moving_multiplier = 2.0  # 移动时的倍数
+        # 每次tick实际使用的衰减量，配置变化后由 _update_decay_rates 重新计算
+        self._decay_still = self.thirst_decay_per_second
+        self._decay_moving = self.thirst_decay_per_second * self.thirst_moving_multiplier
         self.thirst_initial = 100.0
         self.thirst_task = None
-        self.thirst_damage_timer = 0  # 掉血计时器（秒）
+        self.thirst_damage_interval = 10.0  # 口渴值为0时的掉血间隔（秒）
+        self._last_damage_at = time.monotonic()  # 上次掉血检查的时间（time.monotonic）
+        self.thirst_persist_interval = 30  # 每隔多少秒批量保存一次在线玩家口渴值
+        self._ticks_since_persist = 0
+        # 口渴物品配置缓存：小写 item_id -> 数据库行
+        self._thirst_item_cache = {}
+        self._item_cache_version = 0  # 物品缓存每次变动时递增
+        # 已构建的表单缓存，数据未变时重复打开直接复用
+        self._configured_items_form_cache = None  # (物品缓存版本, 表单)
+        self._inventory_form_cache = {}  # xuid -> (背包物品摘要, 表单)
+        self._cached_forms = {}  # 与玩家无关的固定表单，重载配置时清空
+        self._i18n_cache = {}  # (翻译键, 语言) -> 本地化物品名称
+        # 在线玩家索引，在加入/退出事件中维护
+        self._name_to_player = {}  # 小写玩家名 -> 玩家
+        self._xuid_of = weakref.WeakKeyDictionary()  # 玩家 -> xuid，加入时缓存
+        # 在线玩家的口渴值按紧凑下标存放在平行列表中（结构数组），tick 只需顺序遍历
+        # 退出时与末尾元素交换后删除；离线玩家的口渴值保存在 player_xuid_to_thirst
+        self._slot_of = {}  # xuid -> 下标
+        self._slot_xuids = []
+        self._slot_players = []
+        self._slot_thirst = []
+        self._slot_floor = []  # 上次提示时口渴值的整数部分
+        self._dirty_xuids = set()  # 口渴值变化后尚未保存的玩家
+        self._install_loggers()
     
-    def _safe_log(self, level: str, message: str):
+    def _install_loggers(self) -> None:
         """
-        安全的日志记录方法，在logger未初始化时使用print
-        :param level: 日志级别 (info, warning, error)
-        :param message: 日志消息
+        绑定日志方法，logger可用时直接使用logger的方法，否则使用print
+        在on_load开头重新调用一次，之后每次记录日志只有一次调用
         """
-        if hasattr(self, 'logger') and self.logger is not None:
-            if level.lower() == 'info':
-                self.logger.info(message)
-            elif level.lower() == 'warning':
-                self.logger.warning(message)
-            elif level.lower() == 'error':
-                self.logger.error(message)
-            else:
-                self.logger.info(message)
+        try:
+            logger = self.logger
+        except Exception:
+            logger = None
+        # 按玩家输出的info日志先检查此开关，关闭时不再拼接字符串
+        self._log_info_enabled = self._is_info_enabled(logger)
+        if logger is not None:
+            self._log_info = logger.info
+            self._log_warn = logger.warning
+            self._log_error = logger.error
         else:
-            # 如果logger未初始化，使用print
-            print(f"[{level.upper()}] {message}")
+            self._log_info = lambda message: print(f"[INFO] {message}")
+            self._log_warn = lambda message: print(f"[WARNING] {message}")
+            self._log_error = lambda message: print(f"[ERROR] {message}")
+
+    @staticmethod
+    def _is_info_enabled(logger) -> bool:
+        """logger 是否会输出 info 级别日志，无法判断时视为开启"""
+        if logger is None:
+            return True
+        try:
+            if hasattr(logger, 'isEnabledFor'):
+                return logger.isEnabledFor(logging.INFO)
+            if hasattr(logger, 'is_enabled_for'):
+                return logger.is_enabled_for(type(logger).Level.INFO)
+        except Exception:
+            pass
+        return True
 
     def on_load(self) -> None:
-        self._safe_log('info', "[ARCRealisticSurvival] on_load is called!")
+        self._install_loggers()
+        self._log_info("[ARCRealisticSurvival] on_load is called!")
         
         # 初始化设置管理器
         self.setting_manager = SettingManager()
@@ -87,27 +165,33 @@ class ARCRealisticSurvivalPlugin(Plugin):
         
         # 初始化数据库管理器（仅生存相关）
         db_path = os.path.join("Plugins", "ARCRealisticSurvival", "ars_survival.db")
-        self._safe_log('info', f"[ARCRealisticSurvival] Database path: {db_path}")
+        self._log_info(f"[ARCRealisticSurvival] Database path: {db_path}")
         self.db_manager = DatabaseManager(db_path)
         
         # 创建表（仅生存相关）
         self._create_survival_tables()
+        # 载入口渴物品配置缓存
+        self._reload_item_cache()
         # 加载生存-口渴系统配置
         self._load_thirst_settings()
 
     def on_enable(self) -> None:
-        self._safe_log('info', "[ARCRealisticSurvival] on_enable is called!")
+        self._log_info("[ARCRealisticSurvival] on_enable is called!")
         self.register_events(self)
 
+        # 一次性载入所有玩家口渴值，玩家加入时不再逐个查询
+        self._load_all_player_thirst()
+
+        # 插件重载时已在线的玩家不会触发加入事件，在此登记
+        for player in self.server.online_players:
+            self._register_online_player(player)
+
         # 启动口渴值定时任务
         self._start_thirst_timer()
 
     def on_disable(self) -> None:
-        self._safe_log('info', "[ARCRealisticSurvival] on_disable is called!")
+        self._log_info("[ARCRealisticSurvival] on_disable is called!")
         
-        # 关闭数据库连接
-        if hasattr(self, 'db_manager'):
-            self.db_manager.close()
         # 停止口渴定时任务
         if self.thirst_task is not None:
             try:
@@ -115,13 +199,20 @@ class ARCRealisticSurvivalPlugin(Plugin):
             except Exception:
                 pass
             self.thirst_task = None
-        # 保存所有玩家口渴值
+        # 保存所有玩家口渴值（同一事务内一次提交）
         try:
-            for player in self.server.online_players:
-                self._persist_player_thirst(player)
+            self._persist_online_players(self.server.online_players)
         except Exception:
             pass
-    
+        # 关闭数据库连接
+        if hasattr(self, 'db_manager'):
+            self.db_manager.close()
+        # 写出尚未落盘的配置和缺失的语言键，并等待后台写入完成
+        if hasattr(self, 'setting_manager'):
+            self.setting_manager.flush()
+        LanguageManager.flush_missing()
+        wait_for_writes(10.0)
+
     def _init_default_settings(self) -> None:
         """初始化默认配置"""
 
@@ -178,21 +269,13 @@ class ARCRealisticSurvivalPlugin(Plugin):
         if args[0] == "items":
             # 显示数据库中的物品配置
             try:
-                items = self.db_manager.query_all("SELECT * FROM thirst_items ORDER BY item_name")
+                items = self._get_cached_items()
                 if not items:
                     sender.send_message("数据库中没有配置任何物品")
                 else:
                     sender.send_message(f"数据库中共有 {len(items)} 个配置的物品:")
                     for item in items:
-                        buffs_text = ""
-                        if item['buffs']:
-                            try:
-                                buffs = json.loads(item['buffs'])
-                                if buffs:
-                                    buffs_text = f" (Buff: {', '.join([f'{b['name']}({b['duration']}s)' for b in buffs])})"
-                            except:
-                                pass
-                        sender.send_message(f"- {item['item_name']} (ID: {item['item_id']}) - 口渴值: {item['thirst_delta']}{buffs_text}")
+                        sender.send_message(f"- {item['item_name']} (ID: {item['item_id']}) - 口渴值: {item['thirst_delta']}{item['buffs_text']}")
             except Exception as e:
                 sender.send_message(f"查询数据库失败: {e}")
         
@@ -200,18 +283,12 @@ class ARCRealisticSurvivalPlugin(Plugin):
             # 查看玩家口渴值
             player_name = args[1]
             try:
-                player = None
-                for p in self.server.online_players:
-                    if p.name.lower() == player_name.lower():
-                        player = p
-                        break
-                
+                player = self._find_online_player(player_name)
                 if not player:
                     sender.send_message(f"玩家 {player_name} 不在线")
                     return
                 
-                xuid = self._get_player_xuid(player)
-                thirst = self.player_xuid_to_thirst.get(xuid, self.thirst_initial)
+                thirst = self._get_thirst(self._get_player_xuid(player))
                 sender.send_message(f"玩家 {player.name} 的口渴值: {thirst}")
                 
             except Exception as e:
@@ -225,6 +302,8 @@ class ARCRealisticSurvivalPlugin(Plugin):
         # 重新加载配置与物品效果，并重启口渴定时器
         try:
             self._load_thirst_settings()
+            self._reload_item_cache()
+            self._cached_forms.clear()
             # 重启定时任务应用新的节奏
             if self.thirst_task is not None:
                 try:
@@ -234,41 +313,43 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 self.thirst_task = None
             self._start_thirst_timer()
         except Exception as e:
-            self._safe_log('error', f"[ARS] reload settings error: {e}")
+            self._log_error(f"[ARS] reload settings error: {e}")
 
     def _show_survival_config_panel(self, player) -> None:
         """显示生存配置面板"""
         try:
-            from endstone.form import ActionForm
-            
-            title = self.language_manager.GetText("CONFIG_PANEL_TITLE") or "ARC Realistic Survival 配置"
-            form = ActionForm(
-                title=title,
-                content=self.language_manager.GetText("CONFIG_PANEL_DESCRIPTION") or "选择要进行的操作:"
-            )
-            
-            # 添加配置按钮
-            form.add_button(
-                self.language_manager.GetText("CONFIG_THIRST_SETTINGS") or "口渴系统配置",
-                on_click=lambda sender: self._show_thirst_config_form(sender)
-            )
-            
-            # 添加重载按钮
-            form.add_button(
-                self.language_manager.GetText("RELOAD_CONFIG") or "重载配置",
-                on_click=lambda sender: self._handle_reload_command(sender)
-            )
-            
-            # 添加物品管理按钮
-            form.add_button(
-                self.language_manager.GetText("MANAGE_THIRST_ITEMS") or "管理物品口渴值设定",
-                on_click=lambda sender: self._show_items_management_panel(sender)
-            )
+            # 面板内容与玩家无关，首次打开时构建后复用
+            form = self._cached_forms.get('survival_config')
+            if form is None:
+                title = self.language_manager.GetText("CONFIG_PANEL_TITLE") or "ARC Realistic Survival 配置"
+                form = ActionForm(
+                    title=title,
+                    content=self.language_manager.GetText("CONFIG_PANEL_DESCRIPTION") or "选择要进行的操作:"
+                )
+                
+                # 添加配置按钮
+                form.add_button(
+                    self.language_manager.GetText("CONFIG_THIRST_SETTINGS") or "口渴系统配置",
+                    on_click=self._show_thirst_config_form
+                )
+                
+                # 添加重载按钮
+                form.add_button(
+                    self.language_manager.GetText("RELOAD_CONFIG") or "重载配置",
+                    on_click=self._handle_reload_command
+                )
+                
+                # 添加物品管理按钮
+                form.add_button(
+                    self.language_manager.GetText("MANAGE_THIRST_ITEMS") or "管理物品口渴值设定",
+                    on_click=self._show_items_management_panel
+                )
+                self._cached_forms['survival_config'] = form
             
             player.send_form(form)
             
         except Exception as e:
-            self._safe_log('error', f"[ARS] show config panel error: {e}")
+            self._log_error(f"[ARS] show config panel error: {e}")
     
     def _show_thirst_config_form(self, player) -> None:
         """显示口渴配置表单"""
@@ -330,13 +411,11 @@ class ARCRealisticSurvivalPlugin(Plugin):
             )
             player.send_form(panel)
         except Exception as e:
-            self._safe_log('error', f"[ARS] show thirst config form error: {e}")
+            self._log_error(f"[ARS] show thirst config form error: {e}")
     
     def _show_items_management_panel(self, player) -> None:
         """显示物品管理面板"""
         try:
-            from endstone.form import ActionForm
-            
             title = self.language_manager.GetText("ITEMS_MANAGEMENT_TITLE") or "物品口渴值管理"
             form = ActionForm(
                 title=title,
@@ -364,7 +443,7 @@ class ARCRealisticSurvivalPlugin(Plugin):
             player.send_form(form)
             
         except Exception as e:
-            self._safe_log('error', f"[ARS] show items management panel error: {e}")
+            self._log_error(f"[ARS] show items management panel error: {e}")
     
     def _show_inventory_items_panel(self, player) -> None:
         """显示背包物品选择面板"""
@@ -372,7 +451,6 @@ class ARCRealisticSurvivalPlugin(Plugin):
             # 获取背包物品
             inventory_items = self._get_player_inventory_items(player)
             
-            from endstone.form import ActionForm
             title = self.language_manager.GetText("INVENTORY_ITEMS_TITLE") or "背包物品"
             
             if not inventory_items:
@@ -384,13 +462,21 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 player.send_form(form)
                 return
             
+            # 背包内容未变时复用上次构建的表单
+            xuid = self._get_player_xuid(player)
+            inventory_key = tuple((item['type'], item['count'], item['name']) for item in inventory_items)
+            cached = self._inventory_form_cache.get(xuid)
+            if cached is not None and cached[0] == inventory_key:
+                player.send_form(cached[1])
+                return
+            
             form = ActionForm(
                 title=title,
                 content=self.language_manager.GetText("SELECT_ITEM_TO_CONFIG") or "选择要配置口渴效果的物品:"
             )
             
             for item in inventory_items:
-                display_name = f"{item['name']} (ID: {item['type']}) x{item['count']}"
+                display_name = _INV_ITEM_TPL % (item['name'], item['type'], item['count'])
                 form.add_button(
                     display_name,
                     on_click=lambda sender, item_info=item: self._show_item_config_form(sender, item_info)
@@ -401,18 +487,24 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 on_click=lambda sender: self._show_items_management_panel(sender)
             )
             
+            self._inventory_form_cache[xuid] = (inventory_key, form)
             player.send_form(form)
             
         except Exception as e:
-            self._safe_log('error', f"[ARS] show inventory items panel error: {e}")
+            self._log_error(f"[ARS] show inventory items panel error: {e}")
     
     def _show_configured_items_panel(self, player) -> None:
         """显示已配置物品面板"""
         try:
-            # 从数据库获取已配置的物品
-            items = self.db_manager.query_all("SELECT * FROM thirst_items ORDER BY item_name")
+            # 物品配置未变时复用上次构建的表单
+            cached = self._configured_items_form_cache
+            if cached is not None and cached[0] == self._item_cache_version:
+                player.send_form(cached[1])
+                return
+            
+            # 从缓存获取已配置的物品
+            items = self._get_cached_items()
             
-            from endstone.form import ActionForm
             title = self.language_manager.GetText("CONFIGURED_ITEMS_TITLE") or "已配置物品"
             form = ActionForm(
                 title=title,
@@ -426,19 +518,10 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 )
             else:
                 for item in items:
-                    buffs_text = ""
-                    if item['buffs']:
-                        try:
-                            buffs = json.loads(item['buffs'])
-                            if buffs:
-                                buffs_text = f" (Buff: {', '.join([f'{b['name']}({b['duration']}s)' for b in buffs])})"
-                        except:
-                            pass
-                    
-                    display_name = f"{item['item_name']} (ID: {item['item_id']}) - {self.language_manager.GetText('THIRST_VALUE') or '口渴值'}: {item['thirst_delta']}{buffs_text}"
+                    display_name = f"{item['item_name']} (ID: {item['item_id']}) - {self.language_manager.GetText('THIRST_VALUE') or '口渴值'}: {item['thirst_delta']}{item['buffs_text']}"
                     form.add_button(
                         display_name,
-                        on_click=lambda sender, item_id=item['id']: self._edit_existing_item(sender, item_id)
+                        on_click=lambda sender, item_id=item['item_id']: self._edit_existing_item(sender, self._thirst_item_cache.get(item_id))
                     )
             
             form.add_button(
@@ -446,16 +529,15 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 on_click=lambda sender: self._show_items_management_panel(sender)
             )
             
+            self._configured_items_form_cache = (self._item_cache_version, form)
             player.send_form(form)
             
         except Exception as e:
-            self._safe_log('error', f"[ARS] show configured items panel error: {e}")
+            self._log_error(f"[ARS] show configured items panel error: {e}")
     
     def _show_item_config_form(self, player, item) -> None:
         """显示物品配置表单"""
         try:
-            from endstone.form import ModalForm, Label, TextInput
-            
             title = self.language_manager.GetText("ITEM_CONFIG_TITLE") or "配置物品口渴效果"
             
             # 创建标签显示物品信息
@@ -495,24 +577,7 @@ class ARCRealisticSurvivalPlugin(Plugin):
                     buff_durations = data[3].strip()
                     buff_amplifiers = data[4].strip()
                     
-                    buffs = []
-                    if buff_names and buff_durations:
-                        names = [name.strip() for name in buff_names.split(',') if name.strip()]
-                        durations = [int(d.strip()) for d in buff_durations.split(',') if d.strip()]
-                        amplifiers = [int(a.strip()) for a in buff_amplifiers.split(',') if a.strip()] if buff_amplifiers else []
-                        
-                        for i, name in enumerate(names):
-                            if i < len(durations):
-                                buff_data = {
-                                    'name': name,
-                                    'duration': durations[i]
-                                }
-                                # 如果有强度配置，使用配置的强度，否则默认为1
-                                if i < len(amplifiers):
-                                    buff_data['amplifier'] = amplifiers[i]
-                                else:
-                                    buff_data['amplifier'] = 1
-                                buffs.append(buff_data)
+                    buffs = self._parse_buff_inputs(buff_names, buff_durations, buff_amplifiers)
                     
                     # 保存到数据库
                     self._save_thirst_item(item['type'], item['name'], thirst_delta, buffs)
@@ -531,54 +596,53 @@ class ARCRealisticSurvivalPlugin(Plugin):
             player.send_form(form)
             
         except Exception as e:
-            self._safe_log('error', f"[ARS] show item config form error: {e}")
+            self._log_error(f"[ARS] show item config form error: {e}")
     
+    def _parse_buff_inputs(self, names_s: str, durations_s: str, amplifiers_s: str) -> list:
+        """解析表单中逗号分隔的 Buff 名称、持续时间和强度，未配置强度时默认为1"""
+        if not names_s or not durations_s:
+            return []
+        names = [n for n in map(str.strip, names_s.split(',')) if n]
+        durations = [int(d) for d in map(str.strip, durations_s.split(',')) if d]
+        amplifiers = [int(a) for a in map(str.strip, amplifiers_s.split(',')) if a] if amplifiers_s else []
+        amplifier_count = len(amplifiers)
+        return [
+            {'name': name, 'duration': durations[i], 'amplifier': amplifiers[i] if i < amplifier_count else 1}
+            for i, name in enumerate(names[:len(durations)])
+        ]
+
     def _save_thirst_item(self, item_id: str, item_name: str, thirst_delta: float, buffs: list) -> None:
         """保存口渴物品到数据库"""
         try:
-            # 确保物品ID是小写格式
-            item_id = str(item_id).lower()
+            # 背包读取的物品ID已是小写，这里再统一一次，保证与消耗时的查找键一致
+            item_id = item_id.lower()
             
             buffs_json = json.dumps(buffs) if buffs else None
-            now = datetime.datetime.utcnow().isoformat()
-            
-            # 检查是否已存在
-            existing = self.db_manager.query_one("SELECT id FROM thirst_items WHERE item_id=?", (item_id,))
+            now = _utc_now_iso()
             
-            if existing:
-                # 更新
-                data = {
-                    "item_name": item_name,
-                    "thirst_delta": thirst_delta,
-                    "buffs": buffs_json,
-                    "updated_at": now
-                }
-                self.db_manager.update("thirst_items", data, "item_id=?", (item_id,))
-            else:
-                # 插入
-                data = {
-                    "item_id": item_id,
-                    "item_name": item_name,
-                    "thirst_delta": thirst_delta,
-                    "buffs": buffs_json,
-                    "created_at": now,
-                    "updated_at": now
-                }
-                self.db_manager.insert("thirst_items", data)
-                
+            # 不存在则插入，已存在则更新（保留原创建时间）
+            data = {
+                "item_id": item_id,
+                "item_name": item_name,
+                "thirst_delta": thirst_delta,
+                "buffs": buffs_json,
+                "created_at": now,
+                "updated_at": now
+            }
+            self.db_manager.upsert("thirst_items", data, ["item_id"],
+                                   ["item_name", "thirst_delta", "buffs", "updated_at"])
+
+            self._refresh_cached_item(item_id)
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] save thirst item error: {e}")
+            self._log_error(f"[ARCRealisticSurvival] save thirst item error: {e}")
     
-    def _edit_existing_item(self, player, item_id: int) -> None:
-        """编辑已存在的物品"""
+    def _edit_existing_item(self, player, item: dict) -> None:
+        """编辑已存在的物品，item 为物品缓存中的记录（已删除时为None）"""
         try:
-            item = self.db_manager.query_one("SELECT * FROM thirst_items WHERE id=?", (item_id,))
             if not item:
                 player.send_message(self.language_manager.GetText("ITEM_NOT_EXISTS") or "[ARS] 物品不存在")
                 return
             
-            from endstone.form import ModalForm, Label, TextInput
-            
             title = self.language_manager.GetText("EDIT_ITEM_TITLE") or "编辑物品口渴效果"
             
             # 创建标签显示物品信息
@@ -594,19 +658,11 @@ class ARCRealisticSurvivalPlugin(Plugin):
             buffs_text = ""
             buff_durations_text = ""
             buff_amplifiers_text = ""
-            if item['buffs']:
-                try:
-                    buffs = json.loads(item['buffs'])
-                    if buffs:
-                        buffs_text = ', '.join([b['name'] for b in buffs])
-                        buff_durations_text = ', '.join([str(b['duration']) for b in buffs])
-                        # 处理强度，如果没有强度字段则默认为1
-                        amplifiers = []
-                        for b in buffs:
-                            amplifiers.append(str(b.get('amplifier', 1)))
-                        buff_amplifiers_text = ', '.join(amplifiers)
-                except:
-                    pass
+            buffs = item['buffs_parsed']
+            if buffs:
+                buffs_text = ', '.join([b['name'] for b in buffs])
+                buff_durations_text = ', '.join([str(b['duration']) for b in buffs])
+                buff_amplifiers_text = ', '.join([str(b['amplifier']) for b in buffs])
             
             buff_names_input = TextInput(
                 label=self.language_manager.GetText("BUFF_NAMES") or "Buff名称 (可选)",
@@ -635,35 +691,19 @@ class ARCRealisticSurvivalPlugin(Plugin):
                     buff_durations = data[3].strip()
                     buff_amplifiers = data[4].strip()
                     
-                    buffs = []
-                    if buff_names and buff_durations:
-                        names = [name.strip() for name in buff_names.split(',') if name.strip()]
-                        durations = [int(d.strip()) for d in buff_durations.split(',') if d.strip()]
-                        amplifiers = [int(a.strip()) for a in buff_amplifiers.split(',') if a.strip()] if buff_amplifiers else []
-                        
-                        for i, name in enumerate(names):
-                            if i < len(durations):
-                                buff_data = {
-                                    'name': name,
-                                    'duration': durations[i]
-                                }
-                                # 如果有强度配置，使用配置的强度，否则默认为1
-                                if i < len(amplifiers):
-                                    buff_data['amplifier'] = amplifiers[i]
-                                else:
-                                    buff_data['amplifier'] = 1
-                                buffs.append(buff_data)
+                    buffs = self._parse_buff_inputs(buff_names, buff_durations, buff_amplifiers)
                     
                     # 更新数据库
                     buffs_json = json.dumps(buffs) if buffs else None
-                    now = datetime.datetime.utcnow().isoformat()
+                    now = _utc_now_iso()
                     
                     data = {
                         "thirst_delta": thirst_delta,
                         "buffs": buffs_json,
                         "updated_at": now
                     }
-                    self.db_manager.update("thirst_items", data, "id=?", (item_id,))
+                    self.db_manager.update("thirst_items", data, "id=?", (item['id'],))
+                    self._refresh_cached_item(item['item_id'])
                     
                     sender.send_message(f"{self.language_manager.GetText('ITEM_UPDATED') or '[ARS] 已更新物品'}: {item['item_name']} {self.language_manager.GetText('THIRST_EFFECT') or '的口渴效果'}")
                     
@@ -680,7 +720,7 @@ class ARCRealisticSurvivalPlugin(Plugin):
             player.send_form(form)
             
         except Exception as e:
-            self._safe_log('error', f"[ARS] edit existing item error: {e}")
+            self._log_error(f"[ARS] edit existing item error: {e}")
     
     # 数据库（仅生存）
     # 生存-口渴系统：数据库与配置
@@ -691,10 +731,11 @@ class ARCRealisticSurvivalPlugin(Plugin):
             "thirst": "REAL NOT NULL",
             "updated_at": "TEXT NOT NULL"
         }
-        if self.db_manager.create_table("player_thirst", thirst_fields):
-            self._safe_log('info', "[ARCRealisticSurvival] player_thirst table ready")
+        # 以 xuid 为聚簇主键，按 xuid 的 UPSERT 只需探查一棵B树
+        if self.db_manager.create_table("player_thirst", thirst_fields, without_rowid=True):
+            self._log_info("[ARCRealisticSurvival] player_thirst table ready")
         else:
-            self._safe_log('error', "[ARCRealisticSurvival] Failed to create player_thirst table")
+            self._log_error("[ARCRealisticSurvival] Failed to create player_thirst table")
         
         # 口渴物品表
         thirst_items_fields = {
@@ -707,9 +748,55 @@ class ARCRealisticSurvivalPlugin(Plugin):
             "updated_at": "TEXT NOT NULL"
         }
         if self.db_manager.create_table("thirst_items", thirst_items_fields):
-            self._safe_log('info', "[ARCRealisticSurvival] thirst_items table ready")
+            self._log_info("[ARCRealisticSurvival] thirst_items table ready")
         else:
-            self._safe_log('error', "[ARCRealisticSurvival] Failed to create thirst_items table")
+            self._log_error("[ARCRealisticSurvival] Failed to create thirst_items table")
+
+    # 口渴物品配置缓存
+    def _reload_item_cache(self) -> None:
+        """从数据库重新载入全部口渴物品配置"""
+        try:
+            rows = self.db_manager.query_all(_SQL_ALL_ITEMS)
+            self._thirst_item_cache = {row['item_id']: self._prepare_cached_item(row) for row in rows}
+            self._item_cache_version += 1
+        except Exception as e:
+            self._log_error(f"[ARCRealisticSurvival] reload item cache error: {e}")
+
+    def _refresh_cached_item(self, item_id: str) -> None:
+        """数据库写入后刷新单个物品的缓存"""
+        row = self.db_manager.query_one(_SQL_ITEM_BY_ITEM_ID, (item_id,))
+        if row is None:
+            self._thirst_item_cache.pop(item_id, None)
+        else:
+            self._thirst_item_cache[item_id] = self._prepare_cached_item(row)
+        self._item_cache_version += 1
+
+    def _prepare_cached_item(self, row: dict) -> dict:
+        """缓存前预先解析 buffs JSON 并生成展示文本，原始 JSON 仍保留用于写回数据库"""
+        buffs = self._parse_buffs(row['buffs'])
+        row['buffs_parsed'] = buffs
+        row['buffs_text'] = " (Buff: " + ", ".join(f"{b['name']}({b['duration']}s)" for b in buffs) + ")" if buffs else ""
+        return row
+
+    def _parse_buffs(self, buffs_json) -> list:
+        """
+        解析 buffs JSON，空值或格式错误时返回空列表
+        缺少强度字段的旧数据在此补默认值1，并预先生成小写的效果ID（effect）
+        """
+        if not buffs_json:
+            return []
+        try:
+            buffs = _json_loads(buffs_json) or []
+            for buff in buffs:
+                buff.setdefault('amplifier', 1)
+                buff['effect'] = buff['name'].lower()
+            return buffs
+        except Exception:
+            return []
+
+    def _get_cached_items(self) -> list:
+        """按物品名称排序的已配置物品列表"""
+        return sorted(self._thirst_item_cache.values(), key=lambda item: item['item_name'])
 
     def _load_thirst_settings(self) -> None:
         try:
@@ -735,150 +822,275 @@ class ARCRealisticSurvivalPlugin(Plugin):
             else:
                 self.thirst_initial = float(val)
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] load thirst settings error: {e}")
+            self._log_error(f"[ARCRealisticSurvival] load thirst settings error: {e}")
+        self._update_decay_rates()
+
+    def _update_decay_rates(self) -> None:
+        # 静止/移动衰减量只在配置变化时计算，tick中直接读取
+        self._decay_still = self.thirst_decay_per_second
+        self._decay_moving = self.thirst_decay_per_second * self.thirst_moving_multiplier
 
     # 生存-口渴系统：内部工具
     def _clamp_thirst(self, value: float) -> float:
         return max(0.0, min(100.0, value))
 
     def _get_player_xuid(self, player) -> str:
+        # 在线玩家的xuid在加入时已缓存，只需一次字典查找
+        return self._xuid_of.get(player) or self._cache_player_xuid(player)
+
+    def _cache_player_xuid(self, player) -> str:
+        xuid = self._read_player_xuid(player)
+        try:
+            self._xuid_of[player] = xuid
+        except TypeError:
+            # 玩家对象不支持弱引用或不可哈希时无法缓存，改为每次直接读取
+            self._get_player_xuid = self._read_player_xuid
+        return xuid
+
+    def _read_player_xuid(self, player) -> str:
         try:
             return getattr(player, 'xuid', None) or getattr(player, 'uuid', None) or player.name
         except Exception:
             return player.name
 
+    def _find_online_player(self, player_name: str):
+        """按名称（不区分大小写）查找在线玩家"""
+        key = player_name.lower()
+        player = self._name_to_player.get(key)
+        if player is None:
+            # 插件重载时已在线的玩家不会触发加入事件，回退遍历一次并补登
+            for p in self.server.online_players:
+                if p.name.lower() == key:
+                    player = p
+                    self._track_player(p)
+                    break
+        return player
+
+    def _track_player(self, player) -> None:
+        self._cache_player_xuid(player)
+        self._name_to_player[player.name.lower()] = player
+
+    def _untrack_player(self, player) -> None:
+        try:
+            self._xuid_of.pop(player, None)
+        except TypeError:
+            pass
+        self._name_to_player.pop(player.name.lower(), None)
+
     def _get_player_inventory_items(self, player):
         """获取玩家背包物品"""
         try:
-            items = []
-            # 使用EndStone inventory API遍历玩家背包
+            # 使用EndStone inventory API遍历玩家背包，按槽位预分配结果列表
             inventory = player.inventory
-            
-            for slot_index in range(inventory.size):
-                item_stack = inventory.get_item(slot_index)
+            size = inventory.size
+            items = [None] * size
+            get_item = inventory.get_item
+            locale = player.locale
+            i18n_cache = self._i18n_cache
+            
+            for slot_index in range(size):
+                item_stack = get_item(slot_index)
                 
-                if item_stack and item_stack.type and item_stack.amount > 0:
-                    # 获取物品类型ID和显示名称
-                    item_type_id = item_stack.type.id
-                    item_type_translation_key = item_stack.type.translation_key
-                    
-                    # 尝试获取本地化的物品名称
+                # 空槽位在读取任何元数据前跳过
+                if not item_stack or item_stack.amount <= 0:
+                    continue
+                item_type = item_stack.type
+                if not item_type:
+                    continue
+                
+                # 获取物品类型ID和显示名称
+                item_type_id = item_type.id.lower()  # 统一小写，之后保存和查找不再转换
+                item_type_translation_key = item_type.translation_key
+                item_meta = item_stack.item_meta
+                
+                # 获取本地化的物品名称，按 (翻译键, 语言) 缓存
+                i18n_key = (item_type_translation_key, locale)
+                display_name = i18n_cache.get(i18n_key)
+                if display_name is None:
                     try:
                         display_name = self.server.language.translate(
                             item_type_translation_key,
                             None,
-                            player.locale
+                            locale
                         )
+                        i18n_cache[i18n_key] = display_name
                     except:
                         # 如果翻译失败，使用类型ID作为备选
                         display_name = item_type_id
-                    
-                    # 如果有自定义显示名称，优先使用
-                    if item_stack.item_meta and item_stack.item_meta.has_display_name:
-                        display_name = item_stack.item_meta.display_name
-                    
-                    # 获取附魔信息
-                    enchants = {}
-                    if item_stack.item_meta and item_stack.item_meta.enchants:
-                        try:
-                            # 附魔信息直接是字典格式 {enchant_key: level}
-                            if isinstance(item_stack.item_meta.enchants, dict):
-                                enchants = item_stack.item_meta.enchants.copy()
-                            else:
-                                # 如果是列表格式，转换为字典
-                                for enchant in item_stack.item_meta.enchants:
-                                    try:
-                                        if hasattr(enchant, 'type') and hasattr(enchant.type, 'id'):
-                                            enchant_id = enchant.type.id
-                                        else:
-                                            enchant_id = str(enchant.type)
-                                        
-                                        if hasattr(enchant, 'level'):
-                                            enchant_level = enchant.level
-                                        else:
-                                            enchant_level = 1  # 默认等级
-                                        
-                                        enchants[enchant_id] = enchant_level
-                                    except Exception as enchant_error:
-                                        self._safe_log('warning', f"[ARCRealisticSurvival] Failed to get enchant info: {str(enchant_error)}")
-                                        continue
-                        except Exception as e:
-                            self._safe_log('warning', f"[ARCRealisticSurvival] Failed to process enchants: {str(e)}")
-                            enchants = {}
-                    
-                    # 获取Lore信息
-                    lore = []
-                    if item_stack.item_meta and item_stack.item_meta.has_lore:
-                        try:
-                            lore = item_stack.item_meta.lore
-                            if not isinstance(lore, list):
-                                lore = []
-                        except Exception as lore_error:
-                            self._safe_log('warning', f"[ARCRealisticSurvival] Failed to get lore info: {str(lore_error)}")
+                
+                # 如果有自定义显示名称，优先使用
+                if item_meta and item_meta.has_display_name:
+                    display_name = item_meta.display_name
+                
+                # 获取附魔信息
+                enchants = {}
+                meta_enchants = item_meta.enchants if item_meta else None
+                if meta_enchants:
+                    try:
+                        # 附魔信息直接是字典格式 {enchant_key: level}，只读使用，无需复制
+                        if isinstance(meta_enchants, dict):
+                            enchants = meta_enchants
+                        else:
+                            # 如果是列表格式，转换为字典
+                            for enchant in meta_enchants:
+                                try:
+                                    if hasattr(enchant, 'type') and hasattr(enchant.type, 'id'):
+                                        enchant_id = enchant.type.id
+                                    else:
+                                        enchant_id = str(enchant.type)
+                                    
+                                    if hasattr(enchant, 'level'):
+                                        enchant_level = enchant.level
+                                    else:
+                                        enchant_level = 1  # 默认等级
+                                    
+                                    enchants[enchant_id] = enchant_level
+                                except Exception as enchant_error:
+                                    self._log_warn(f"[ARCRealisticSurvival] Failed to get enchant info: {str(enchant_error)}")
+                                    continue
+                    except Exception as e:
+                        self._log_warn(f"[ARCRealisticSurvival] Failed to process enchants: {str(e)}")
+                        enchants = {}
+                
+                # 获取Lore信息
+                lore = []
+                if item_meta and item_meta.has_lore:
+                    try:
+                        lore = item_meta.lore
+                        if not isinstance(lore, list):
                             lore = []
-                    
-                    items.append({
-                        'type': item_type_id,  # 使用类型ID而不是ItemType对象
-                        'type_translation_key': item_type_translation_key,  # 保存翻译键
-                        'name': display_name,
-                        'count': item_stack.amount,
-                        'data': item_stack.data,
-                        'enchants': enchants,  # 保存附魔信息
-                        'lore': lore,  # 保存Lore信息
-                        'slot_index': slot_index  # 记录槽位索引，用于后续操作
-                    })
+                    except Exception as lore_error:
+                        self._log_warn(f"[ARCRealisticSurvival] Failed to get lore info: {str(lore_error)}")
+                        lore = []
+                
+                items[slot_index] = {
+                    'type': item_type_id,  # 使用类型ID而不是ItemType对象
+                    'type_translation_key': item_type_translation_key,  # 保存翻译键
+                    'name': display_name,
+                    'count': item_stack.amount,
+                    'data': item_stack.data,
+                    'enchants': enchants,  # 保存附魔信息
+                    'lore': lore,  # 保存Lore信息
+                    'slot_index': slot_index  # 记录槽位索引，用于后续操作
+                }
             
-            return items
+            return [item for item in items if item is not None]
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] Get player inventory error: {str(e)}")
+            self._log_error(f"[ARCRealisticSurvival] Get player inventory error: {str(e)}")
             return []
 
+    def _load_all_player_thirst(self) -> None:
+        """启用时一次查询载入全部玩家的口渴值"""
+        try:
+            rows = self.db_manager.query_all(_SQL_ALL_PLAYER_THIRST, raw=True)
+            self.player_xuid_to_thirst = {row['xuid']: float(row['thirst']) for row in rows}
+            self._log_info(f"[ARCRealisticSurvival] Loaded thirst for {len(rows)} players")
+        except Exception as e:
+            self._log_error(f"[ARCRealisticSurvival] load all player thirst error: {e}")
+
     def _load_player_thirst(self, player) -> float:
         xuid = self._get_player_xuid(player)
-        self._safe_log('info', f"[ARCRealisticSurvival] Loading thirst for player {player.name} (XUID: {xuid})")
-        row = self.db_manager.query_one("SELECT thirst FROM player_thirst WHERE xuid=?", (xuid,))
-        if row is None:
+        if self._log_info_enabled:
+            self._log_info(f"[ARCRealisticSurvival] Loading thirst for player {player.name} (XUID: {xuid})")
+        thirst = self.player_xuid_to_thirst.get(xuid)
+        if thirst is None:
+            # 启用时已载入全部记录，不在字典中的即为新玩家
             self.player_xuid_to_thirst[xuid] = self.thirst_initial
-            self._safe_log('info', f"[ARCRealisticSurvival] New player {player.name}, setting initial thirst: {self.thirst_initial}")
+            if self._log_info_enabled:
+                self._log_info(f"[ARCRealisticSurvival] New player {player.name}, setting initial thirst: {self.thirst_initial}")
             # 插入一条
             self.db_manager.insert("player_thirst", {
                 "xuid": xuid,
                 "player_name": player.name,
                 "thirst": self.thirst_initial,
-                "updated_at": datetime.datetime.utcnow().isoformat()
+                "updated_at": _utc_now_iso()
             })
-        else:
-            self.player_xuid_to_thirst[xuid] = float(row["thirst"])
-            self._safe_log('info', f"[ARCRealisticSurvival] Loaded existing thirst for {player.name}: {row['thirst']}")
+        elif self._log_info_enabled:
+            self._log_info(f"[ARCRealisticSurvival] Loaded existing thirst for {player.name}: {thirst}")
         return self.player_xuid_to_thirst[xuid]
 
     def _persist_player_thirst(self, player) -> None:
+        # 单个玩家同样走批量写入路径
+        self._persist_online_players((player,))
+
+    def _persist_dirty_players(self) -> None:
+        """只保存上次保存后口渴值有变化的在线玩家"""
+        if not self._dirty_xuids:
+            return
+        slot_of = self._slot_of
+        slot_players = self._slot_players
+        players = [slot_players[slot_of[xuid]] for xuid in self._dirty_xuids if xuid in slot_of]
+        # 不在线的玩家已在退出时保存
+        self._dirty_xuids.clear()
+        self._persist_online_players(players)
+
+    def _persist_online_players(self, players) -> None:
+        """用一条批量UPSERT保存多名玩家的口渴值，只提交一次"""
         try:
-            xuid = self._get_player_xuid(player)
-            thirst = float(self.player_xuid_to_thirst.get(xuid, self.thirst_initial))
-            # self._safe_log('info', f"[ARCRealisticSurvival] Saving thirst for player {player.name}: {thirst}")
-            exists = self.db_manager.query_one("SELECT xuid FROM player_thirst WHERE xuid=?", (xuid,))
-            data = {
-                "player_name": player.name,
-                "thirst": thirst,
-                "updated_at": datetime.datetime.utcnow().isoformat()
-            }
-            if exists is None:
-                data_with_key = {"xuid": xuid}
-                data_with_key.update(data)
-                self.db_manager.insert("player_thirst", data_with_key)
-                # self._safe_log('info', f"[ARCRealisticSurvival] Inserted new thirst record for {player.name}")
-            else:
-                self.db_manager.update("player_thirst", data, "xuid=?", (xuid,))
-                # self._safe_log('info', f"[ARCRealisticSurvival] Updated thirst record for {player.name}")
+            now = _utc_now_iso()
+            dirty = self._dirty_xuids
+            rows = []
+            for player in players:
+                xuid = self._get_player_xuid(player)
+                rows.append((xuid, player.name, float(self._get_thirst(xuid)), now))
+                dirty.discard(xuid)
+            if rows:
+                self.db_manager.executemany(_SQL_UPSERT_PLAYER_THIRST, rows)
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] persist thirst error: {e}")
+            self._log_error(f"[ARCRealisticSurvival] persist thirst error: {e}")
+
+    # 在线玩家口渴值存储
+    def _add_slot(self, player, xuid: str) -> None:
+        idx = self._slot_of.get(xuid)
+        if idx is not None:
+            self._slot_players[idx] = player
+            return
+        self._slot_of[xuid] = len(self._slot_xuids)
+        self._slot_xuids.append(xuid)
+        self._slot_players.append(player)
+        value = float(self.player_xuid_to_thirst.get(xuid, self.thirst_initial))
+        self._slot_thirst.append(value)
+        self._slot_floor.append(math.floor(value))
+
+    def _remove_slot(self, xuid: str) -> None:
+        idx = self._slot_of.pop(xuid, None)
+        if idx is None:
+            return
+        # 写回离线存储，再把末尾元素移到空出的位置
+        self.player_xuid_to_thirst[xuid] = self._slot_thirst[idx]
+        last = len(self._slot_xuids) - 1
+        if idx != last:
+            moved = self._slot_xuids[last]
+            self._slot_xuids[idx] = moved
+            self._slot_players[idx] = self._slot_players[last]
+            self._slot_thirst[idx] = self._slot_thirst[last]
+            self._slot_floor[idx] = self._slot_floor[last]
+            self._slot_of[moved] = idx
+        self._slot_xuids.pop()
+        self._slot_players.pop()
+        self._slot_thirst.pop()
+        self._slot_floor.pop()
+
+    def _get_thirst(self, xuid: str) -> float:
+        idx = self._slot_of.get(xuid)
+        if idx is not None:
+            return self._slot_thirst[idx]
+        return self.player_xuid_to_thirst.get(xuid, self.thirst_initial)
+
+    def _set_thirst(self, xuid: str, value: float) -> None:
+        self._dirty_xuids.add(xuid)
+        idx = self._slot_of.get(xuid)
+        if idx is not None:
+            self._slot_thirst[idx] = value
+            self._slot_floor[idx] = math.floor(value)
+        else:
+            self.player_xuid_to_thirst[xuid] = value
 
     def _apply_thirst_delta(self, player, delta: float) -> float:
         xuid = self._get_player_xuid(player)
-        current = float(self.player_xuid_to_thirst.get(xuid, self.thirst_initial))
+        current = float(self._get_thirst(xuid))
         new_val = self._clamp_thirst(current + delta)
-        self.player_xuid_to_thirst[xuid] = new_val
+        self._set_thirst(xuid, new_val)
         
         # 每次变动都显示提示
         actual_change = math.floor(new_val) - math.floor(current)
@@ -899,45 +1111,56 @@ class ARCRealisticSurvivalPlugin(Plugin):
             # 每秒执行一次口渴值计算
             def tick():
                 try:
-                    # 增加掉血计时器
-                    self.thirst_damage_timer += 1
-                    
-                    for player in self.server.online_players:
-                        base_decay = self.thirst_decay_per_second
-                        # 移动状态由最近移动事件标记
-                        xuid = self._get_player_xuid(player)
-                        moving_flag = self.player_moving_flags.get(xuid, False)
-                        decay = base_decay if not moving_flag else base_decay * self.thirst_moving_multiplier
-                        if decay > 0:
-                            self._apply_thirst_delta(player, -decay)
-                            # 调试：显示口渴值变化
-                            # if moving_flag:
-                            #     self._safe_log('info', f"[ARCRealisticSurvival] Player {player.name} moving, decay: {decay} (base: {base_decay} x {self.thirst_moving_multiplier})")
-                            # else:
-                            #     self._safe_log('info', f"[ARCRealisticSurvival] Player {player.name} stationary, decay: {decay}")
-                        
-                        # 检查口渴值掉血（每10秒检查一次）
-                        if self.thirst_damage_timer >= 10:
-                            current_thirst = self.player_xuid_to_thirst.get(xuid, self.thirst_initial)
-                            if current_thirst <= 0:
-                                # 口渴值为0，造成伤害
-                                self._apply_thirst_damage(player)
-                            else:
-                                # 口渴值大于0，重置计时器（避免重复提示）
-                                pass
-                        
-                        # 每次循环后重置移动标记（在下一秒重新检测）
-                        if xuid in self.player_moving_flags:
-                            del self.player_moving_flags[xuid]
-                        # 定期保存
-                        self._persist_player_thirst(player)
-                    
-                    # 每10秒重置掉血计时器
-                    if self.thirst_damage_timer >= 10:
-                        self.thirst_damage_timer = 0
+                    # 没有在线玩家时无事可做（退出的玩家已在退出时保存）
+                    if not self._slot_xuids:
+                        return
+
+                    self._ticks_since_persist += 1
+
+                    # 衰减量在载入配置时已计算好
+                    decay_still = self._decay_still
+                    decay_moving = self._decay_moving
+
+                    # 上次tick后移动过的玩家
+                    moving = self.player_moving
+
+                    # 顺序遍历在线玩家的平行列表，按移动状态选择衰减量
+                    xuids = self._slot_xuids
+                    slot_players = self._slot_players
+                    thirst = self._slot_thirst
+                    floors = self._slot_floor
+                    dirty = self._dirty_xuids
+                    for i in range(len(xuids)):
+                        old = thirst[i]
+                        new = old - (decay_moving if xuids[i] in moving else decay_still)
+                        if new < 0.0:
+                            new = 0.0
+                        if new == old:
+                            continue
+                        thirst[i] = new
+                        dirty.add(xuids[i])
+                        # 与上次提示的整数部分比较，只提示跨过整数的玩家（new >= 0，int 即向下取整）
+                        new_floor = int(new)
+                        if new_floor != floors[i]:
+                            floors[i] = new_floor
+                            slot_players[i].send_tip(f"口渴值: {new_floor}")
+                    # 移动标记只对本次tick有效
+                    moving.clear()
+
+                    # 检查口渴值掉血（按实际经过时间每10秒检查一次，调度器延迟时不会漂移），只对口渴值为0的玩家造成伤害
+                    now = time.monotonic()
+                    if now - self._last_damage_at >= self.thirst_damage_interval:
+                        self._last_damage_at = now
+                        for player in [slot_players[i] for i, value in enumerate(thirst) if value <= 0]:
+                            self._apply_thirst_damage(player)
+
+                    # 定期批量保存有变化的玩家（一个事务一次提交）
+                    if self._ticks_since_persist >= self.thirst_persist_interval:
+                        self._ticks_since_persist = 0
+                        self._persist_dirty_players()
                         
                 except Exception as e:
-                    self._safe_log('error', f"[ARCRealisticSurvival] thirst timer error: {e}")
+                    self._log_error(f"[ARCRealisticSurvival] thirst timer error: {e}")
 
             # 优先使用服务器调度器（Endstone: scheduler.run_task(plugin, task, delay, period)）
             scheduler = getattr(self.server, 'scheduler', None)
@@ -945,63 +1168,60 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 # delay 与 period 单位均为 tick（20 tick = 1 秒）
                 self.thirst_task = scheduler.run_task(self, tick, 20, 20)
             else:
-                # 无调度器时使用 threading.Timer 兜底
+                # 无调度器时使用后台线程兜底
                 try:
                     import threading
                     class _ArcTimer:
+                        # 单个常驻线程按固定间隔执行，不再每次新建 threading.Timer
                         def __init__(self, interval, target):
                             self.interval = interval
                             self.target = target
-                            self._stop = False
-                            self._timer = None
-                            self._schedule()
-
-                        def _schedule(self):
-                            if self._stop:
-                                return
-                            self._timer = threading.Timer(self.interval, self._run)
-                            self._timer.daemon = True
-                            self._timer.start()
-
-                        def _run(self):
-                            try:
+                            self._stop = threading.Event()
+                            self._thread = threading.Thread(target=self._loop, daemon=True)
+                            self._thread.start()
+
+                        def _loop(self):
+                            while not self._stop.wait(self.interval):
                                 self.target()
-                            finally:
-                                self._schedule()
 
                         def cancel(self):
-                            self._stop = True
-                            try:
-                                if self._timer is not None:
-                                    self._timer.cancel()
-                            except Exception:
-                                pass
+                            self._stop.set()
 
                     self.thirst_task = _ArcTimer(1.0, tick)
-                    self._safe_log('warning', "[ARCRealisticSurvival] No server scheduler; using threading.Timer fallback for thirst.")
+                    self._log_warn("[ARCRealisticSurvival] No server scheduler; using background thread fallback for thirst.")
                 except Exception:
-                    self._safe_log('warning', "[ARCRealisticSurvival] No scheduler available; thirst will not tick.")
+                    self._log_warn("[ARCRealisticSurvival] No scheduler available; thirst will not tick.")
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] start thirst timer error: {e}")
+            self._log_error(f"[ARCRealisticSurvival] start thirst timer error: {e}")
 
     # 生存-口渴系统：事件
     @event_handler()
     def on_player_join(self, event: PlayerJoinEvent):
         player = event.player
-        # self._safe_log('info', f"[ARCRealisticSurvival] Player {player.name} joined, loading thirst")
+        # self._log_info(f"[ARCRealisticSurvival] Player {player.name} joined, loading thirst")
+        self._register_online_player(player)
+
+    def _register_online_player(self, player) -> None:
+        self._track_player(player)
         self._load_player_thirst(player)
+        self._add_slot(player, self._get_player_xuid(player))
 
     @event_handler()
     def on_player_quit(self, event: PlayerQuitEvent):
         player = event.player
-        # self._safe_log('info', f"[ARCRealisticSurvival] Player {player.name} quit, saving thirst")
+        # self._log_info(f"[ARCRealisticSurvival] Player {player.name} quit, saving thirst")
         self._persist_player_thirst(player)
+        xuid = self._get_player_xuid(player)
+        self._inventory_form_cache.pop(xuid, None)
+        self.player_moving.discard(xuid)
+        self._remove_slot(xuid)
+        self._untrack_player(player)
 
     @event_handler()
     def on_player_move(self, event: PlayerMoveEvent):
         player = event.player
-        xuid = self._get_player_xuid(player)
-        self.player_moving_flags[xuid] = True
+        # 只做标记，移动/静止状态在口渴tick中统一使用
+        self.player_moving.add(self._get_player_xuid(player))
 
     @event_handler()
     def on_player_item_consume(self, event: PlayerItemConsumeEvent):
@@ -1010,7 +1230,7 @@ class ARCRealisticSurvivalPlugin(Plugin):
             item = event.item
             
             # 调试：打印物品信息
-            # self._safe_log('info', f"[ARS] Player {player.name} consumed item: {item}")
+            # self._log_info(f"[ARS] Player {player.name} consumed item: {item}")
             
             item_key = None
             try:
@@ -1024,41 +1244,38 @@ class ARCRealisticSurvivalPlugin(Plugin):
                 else:
                     item_key = str(item)
             except Exception as e:
-                self._safe_log('error', f"[ARS] Failed to get item key: {e}")
+                self._log_error(f"[ARS] Failed to get item key: {e}")
                 item_key = None
                 
             if item_key is None:
-                self._safe_log('warning', f"[ARS] Could not determine item key for consumed item")
+                self._log_warn(f"[ARS] Could not determine item key for consumed item")
                 return
             
             item_id = str(item_key).lower()
-            # self._safe_log('info', f"[ARS] Item ID: {item_id}")
+            # self._log_info(f"[ARS] Item ID: {item_id}")
             
-            # 从数据库获取物品配置
-            item_config = self.db_manager.query_one("SELECT * FROM thirst_items WHERE item_id=?", (item_id,))
+            # 从缓存获取物品配置
+            item_config = self._thirst_item_cache.get(item_id)
             if item_config is None:
-                # self._safe_log('info', f"[ARS] No thirst config found for item: {item_id}")
+                # self._log_info(f"[ARS] No thirst config found for item: {item_id}")
                 return
             
-            # self._safe_log('info', f"[ARS] Found thirst config for {item_id}: {item_config}")
+            # self._log_info(f"[ARS] Found thirst config for {item_id}: {item_config}")
             
-            # 应用口渴值变化
-            thirst_delta = float(item_config['thirst_delta'])
-            self._apply_thirst_delta(player, thirst_delta)
+            # 应用口渴值变化（REAL 列，读出即为 float）
+            self._apply_thirst_delta(player, item_config['thirst_delta'])
             
-            # 应用Buff效果
-            if item_config['buffs']:
+            # 应用Buff效果（buffs 已在载入缓存时解析）
+            buffs = item_config['buffs_parsed']
+            if buffs:
                 try:
-                    buffs = json.loads(item_config['buffs'])
                     for buff in buffs:
-                        amplifier = buff.get('amplifier', 1)  # 默认强度为1
-                        self._apply_buff_to_player(player, buff['name'], buff['duration'], amplifier)
+                        self._apply_buff_to_player(player, buff['effect'], buff['duration'], buff['amplifier'])
                 except Exception as e:
-                    self._safe_log('error', f"[ARCRealisticSurvival] apply buffs error: {e}")
-            
-            self._persist_player_thirst(player)
+                    self._log_error(f"[ARCRealisticSurvival] apply buffs error: {e}")
+            # 口渴值已标记为待保存，由定时批量保存写入
         except Exception as e:
-            self._safe_log('error', f"[ARS] consume event error: {e}")
+            self._log_error(f"[ARS] consume event error: {e}")
     
     @event_handler
     def on_actor_death(self, event: PlayerDeathEvent):
@@ -1068,15 +1285,16 @@ class ARCRealisticSurvivalPlugin(Plugin):
             xuid = self._get_player_xuid(player)
             
             # 重置口渴值为初始值
-            self.player_xuid_to_thirst[xuid] = self.thirst_initial
+            self._set_thirst(xuid, self.thirst_initial)
             
             # 保存到数据库
             self._persist_player_thirst(player)
             
-            self._safe_log('info', f"[ARCRealisticSurvival] 玩家 {player.name} 死亡，重置口渴值为 {self.thirst_initial}")
+            if self._log_info_enabled:
+                self._log_info(f"[ARCRealisticSurvival] 玩家 {player.name} 死亡，重置口渴值为 {self.thirst_initial}")
             
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] 处理玩家死亡事件时出错: {e}")
+            self._log_error(f"[ARCRealisticSurvival] 处理玩家死亡事件时出错: {e}")
     
     def _apply_thirst_damage(self, player) -> None:
         """给口渴值为0的玩家造成伤害"""
@@ -1087,7 +1305,7 @@ class ARCRealisticSurvivalPlugin(Plugin):
             
             # 检查玩家当前口渴值是否仍然为0
             xuid = self._get_player_xuid(player)
-            current_thirst = self.player_xuid_to_thirst.get(xuid, self.thirst_initial)
+            current_thirst = self._get_thirst(xuid)
             if current_thirst > 0:
                 return  # 口渴值已经恢复，不造成伤害
             
@@ -1101,13 +1319,12 @@ class ARCRealisticSurvivalPlugin(Plugin):
             player.send_tip("§受到口渴伤害！")
                 
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] apply thirst damage error: {e}")
+            self._log_error(f"[ARCRealisticSurvival] apply thirst damage error: {e}")
 
-    def _apply_buff_to_player(self, player, buff_name: str, duration: int, amplifier: int = 1) -> None:
-        """给玩家应用Buff效果"""
+    def _apply_buff_to_player(self, player, effect: str, duration: int, amplifier: int = 1) -> None:
+        """给玩家应用Buff效果，effect 为小写的效果ID"""
         try:
             # 使用命令：effect <player> <effect> <time> <amplifier>
-            cmd = f"effect {player.name} {buff_name.lower()} {duration} {amplifier}"
-            self.server.dispatch_command(self.server.command_sender, cmd)
+            self.server.dispatch_command(self.server.command_sender, f"effect {player.name} {effect} {duration} {amplifier}")
         except Exception as e:
-            self._safe_log('error', f"[ARCRealisticSurvival] apply buff error: {e}")
+            self._log_error(f"[ARCRealisticSurvival] apply buff error: {e}")